@@ -3,12 +3,18 @@ from discord import app_commands
 from discord.ext import commands
 import json
 import asyncio
-import requests
+import aiohttp
+from cachetools import TTLCache
 from typing import Optional
 import os
 import logging
 import webserver
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -22,99 +28,305 @@ intents.message_content = True
 intents.members = True
 
 bot = commands.Bot(command_prefix="!", intents=intents)
+bot.session: aiohttp.ClientSession | None = None
+bot.writer_task: asyncio.Task | None = None
 tree = bot.tree
 
 # Data file
 DATA_FILE = os.getenv("DATA_FILE", "items_data.json")
 
+# Set SAVE_FSYNC=0 to skip fsync on saves (faster, less crash-safe)
+SAVE_FSYNC = os.getenv("SAVE_FSYNC", "1") != "0"
+
+# Set LEGACY_GAMEPASS_API=1 to fall back to listing the user's gamepasses
+# instead of the direct inventory ownership check
+LEGACY_GAMEPASS_API = os.getenv("LEGACY_GAMEPASS_API", "0") == "1"
+
+
+# In-memory copy of the data file, re-read only when the file changes on disk.
+# "index" maps item name -> item dict for O(1) lookups.
+_cache = {"data": None, "mtime": 0, "index": {}}
+
 
 # Load/Save data functions
 def load_data():
-    """Load data from JSON file"""
+    """Load data from JSON file, cached in memory until the file changes"""
     if os.path.exists(DATA_FILE):
+        mtime = os.stat(DATA_FILE).st_mtime
+        if _cache["data"] is not None and _cache["mtime"] == mtime:
+            return _cache["data"]
         try:
-            with open(DATA_FILE, 'r') as f:
-                return json.load(f)
-        except json.JSONDecodeError:
+            with open(DATA_FILE, 'rb') as f:
+                raw = f.read()
+            _cache["data"] = orjson.loads(raw) if orjson else json.loads(raw)
+            _cache["mtime"] = mtime
+            _cache["index"] = {i["name"]: i for i in _cache["data"]["items"]}
+            # Migrate older files that stored gamepass IDs as strings
+            for item in _cache["data"]["items"]:
+                try:
+                    item["gamepass_id"] = int(item["gamepass_id"])
+                except (TypeError, ValueError):
+                    pass
+            return _cache["data"]
+        except ValueError:
             logger.error(f"Error decoding {DATA_FILE}, creating new file")
-            return {"items": []}
-    return {"items": []}
-
-
-def save_data(data):
-    """Save data to JSON file"""
+            _cache["data"] = {"items": []}
+            _cache["index"] = {}
+            _cache["mtime"] = mtime
+            return _cache["data"]
+    if _cache["data"] is None:
+        _cache["data"] = {"items": []}
+        _cache["index"] = {}
+    return _cache["data"]
+
+
+def _save_sync(data):
+    """Write data to a temp file and atomically replace the data file"""
+    tmp = DATA_FILE + ".tmp"
     try:
-        with open(DATA_FILE, 'w') as f:
-            json.dump(data, f, indent=4)
+        with open(tmp, 'wb') as f:
+            if orjson:
+                f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_APPEND_NEWLINE))
+            else:
+                f.write(json.dumps(data, indent=4).encode())
+            if SAVE_FSYNC:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp, DATA_FILE)
+        _cache["data"] = data
+        _cache["mtime"] = os.stat(DATA_FILE).st_mtime
         logger.info("Data saved successfully")
     except Exception as e:
         logger.error(f"Error saving data: {e}")
 
 
+async def save_data_async(data):
+    """Save data to JSON file without blocking the event loop"""
+    await asyncio.to_thread(_save_sync, data)
+
+
+# Background writer: coalesces bursts of saves into one write per 500ms
+_dirty_event = asyncio.Event()
+
+
+def mark_dirty():
+    """Schedule a coalesced background save of the cached data"""
+    _options_cache["mtime"] = -1
+    _showall_cache["mtime"] = -1
+    _dirty_event.set()
+
+
+async def _writer_loop():
+    while True:
+        await _dirty_event.wait()
+        await asyncio.sleep(0.5)
+        _dirty_event.clear()
+        await save_data_async(_cache["data"])
+
+
 # Roblox API functions
-def get_user_id_from_username(username):
-    """Convert Roblox username to user ID"""
-    url = "https://users.roblox.com/v1/usernames/users"
-    payload = {"usernames": [username]}
 
+async def _request_json(session, method, url, *, json_payload=None, attempts=3):
+    """Issue a request, backing off on 429/502/503 and honoring Retry-After"""
+    for attempt in range(attempts):
+        async with session.request(method, url, json=json_payload) as response:
+            if response.status in (429, 502, 503) and attempt < attempts - 1:
+                retry_after = response.headers.get("Retry-After")
+                delay = float(retry_after) if retry_after else 2 ** attempt
+                logger.warning(f"Got {response.status} from {url}, retrying in {delay:.1f}s")
+                await asyncio.sleep(delay)
+                continue
+            response.raise_for_status()
+            return await response.json()
+
+
+# Username lookups rarely change, so cache them for 10 minutes. Per-key locks
+# stop concurrent verifications from firing duplicate requests for one name.
+_user_id_cache = TTLCache(maxsize=1024, ttl=600)
+_user_id_locks: dict[str, asyncio.Lock] = {}
+
+
+async def get_user_id_from_username(session, username):
+    """Convert Roblox username to user ID, with a short-lived cache"""
+    key = username.lower()
+
+    user_id = _user_id_cache.get(key)
+    if user_id is not None:
+        return user_id
+
+    lock = _user_id_locks.setdefault(key, asyncio.Lock())
+    try:
+        async with lock:
+            user_id = _user_id_cache.get(key)
+            if user_id is not None:
+                return user_id
+
+            url = "https://users.roblox.com/v1/usernames/users"
+            payload = {"usernames": [username]}
+
+            try:
+                data = await _request_json(session, "POST", url, json_payload=payload)
+
+                if data.get("data") and len(data["data"]) > 0:
+                    user_id = data["data"][0]["id"]
+                    _user_id_cache[key] = user_id
+                    return user_id
+                return None
+            except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                logger.error(f"Error getting user ID: {e}")
+                return None
+    finally:
+        _user_id_locks.pop(key, None)
+
+
+# In-flight ownership checks keyed by (user_id, gamepass_id): concurrent
+# callers await the same request instead of each hitting Roblox. Negative
+# results are remembered briefly to absorb tight polling loops.
+_inflight: dict[tuple, asyncio.Future] = {}
+_negative_cache = TTLCache(maxsize=1024, ttl=2)
+
+
+async def check_gamepass_ownership(session, user_id, gamepass_id):
+    """Check if user owns a specific gamepass, deduplicating concurrent calls"""
+    key = (user_id, int(gamepass_id))
+
+    if key in _negative_cache:
+        return False
+
+    fut = _inflight.get(key)
+    if fut is not None:
+        return await fut
+
+    fut = asyncio.get_running_loop().create_future()
+    _inflight[key] = fut
     try:
-        response = requests.post(url, json=payload, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        result = await _fetch_gamepass_ownership(session, user_id, gamepass_id)
+    except Exception as e:
+        fut.set_exception(e)
+        raise
+    else:
+        if not result:
+            _negative_cache[key] = True
+        fut.set_result(result)
+        return result
+    finally:
+        _inflight.pop(key, None)
+
 
-        if data.get("data") and len(data["data"]) > 0:
-            return data["data"][0]["id"]
-        return None
-    except requests.exceptions.RequestException as e:
-        logger.error(f"Error getting user ID: {e}")
-        return None
+async def _fetch_gamepass_ownership(session, user_id, gamepass_id):
+    """Ask Roblox whether the user owns the gamepass"""
+    if LEGACY_GAMEPASS_API:
+        return await _fetch_gamepass_ownership_legacy(session, user_id, gamepass_id)
 
+    url = f"https://inventory.roblox.com/v1/users/{user_id}/items/GamePass/{gamepass_id}"
+
+    try:
+        data = await _request_json(session, "GET", url)
+
+        owned = bool(data.get("data"))
+        if owned:
+            logger.info(f"✅ User owns gamepass {gamepass_id}")
+        else:
+            logger.info(f"❌ User does not own gamepass {gamepass_id}")
+        return owned
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+        logger.error(f"Error checking gamepass ownership: {e}")
+        return False
 
-def check_gamepass_ownership(user_id, gamepass_id):
-    """Check if user owns a specific gamepass"""
+
+async def _fetch_gamepass_ownership_legacy(session, user_id, gamepass_id):
+    """Hit the Roblox API for the user's gamepass list"""
     url = f"https://apis.roblox.com/game-passes/v1/users/{user_id}/game-passes?count=100"
 
     try:
-        response = requests.get(url, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        data = await _request_json(session, "GET", url)
 
         logger.info(f"Checking gamepass ownership for user {user_id}")
         logger.debug(f"Looking for gamepass ID: {gamepass_id}")
 
-        if "gamePasses" in data:
-            for gamepass in data["gamePasses"]:
-                if str(gamepass.get("gamePassId")) == str(gamepass_id):
-                    logger.info(f"✅ User owns gamepass {gamepass_id}")
-                    return True
-            logger.info(f"❌ User does not own gamepass {gamepass_id}")
-        else:
+        if "gamePasses" not in data:
             logger.warning("No 'gamePasses' key in response")
+            return False
 
-        return False
-    except requests.exceptions.RequestException as e:
+        target = int(gamepass_id)
+        owned = any(gp.get("gamePassId") == target for gp in data["gamePasses"])
+        if owned:
+            logger.info(f"✅ User owns gamepass {gamepass_id}")
+        else:
+            logger.info(f"❌ User does not own gamepass {gamepass_id}")
+        return owned
+    except (aiohttp.ClientError, asyncio.TimeoutError) as e:
         logger.error(f"Error checking gamepass ownership: {e}")
         return False
 
 
+# Select options for the store, rebuilt only when the item data changes
+_options_cache = {"mtime": -1, "options": []}
+
+# Pre-built /showall embeds, reused until the item data changes
+_showall_cache = {"mtime": -1, "embeds": []}
+
+
+def get_item_options():
+    """Return the cached SelectOption list for the current item data"""
+    if _options_cache["mtime"] != _cache["mtime"]:
+        _options_cache["options"] = [
+            discord.SelectOption(label=item["name"], value=item["name"])
+            for item in _cache["data"]["items"]
+        ]
+        _options_cache["mtime"] = _cache["mtime"]
+    return _options_cache["options"]
+
+
 # View for item selection (DM interaction)
 class ItemSelectView(discord.ui.View):
+    # Discord allows at most 25 options per select menu
+    PAGE_SIZE = 25
+
     def __init__(self, items, user):
         super().__init__(timeout=180)
         self.user = user
+        self.page = 0
+        self.all_options = get_item_options()
+        self.max_page = max(0, (len(self.all_options) - 1) // self.PAGE_SIZE)
 
-        # Create a select menu with all items
-        options = [
-            discord.SelectOption(label=item["name"], value=item["name"])
-            for item in items
-        ]
-
-        select = discord.ui.Select(
+        self.select = discord.ui.Select(
             placeholder="Choose an item to purchase...",
-            options=options
+            options=self._page_options()
         )
-        select.callback = self.select_callback
-        self.add_item(select)
+        self.select.callback = self.select_callback
+        self.add_item(self.select)
+
+        if self.max_page > 0:
+            prev_button = discord.ui.Button(label="◀ Prev", style=discord.ButtonStyle.gray)
+            prev_button.callback = self.prev_page
+            next_button = discord.ui.Button(label="Next ▶", style=discord.ButtonStyle.gray)
+            next_button.callback = self.next_page
+            self.add_item(prev_button)
+            self.add_item(next_button)
+
+    def _page_options(self):
+        start = self.page * self.PAGE_SIZE
+        return self.all_options[start:start + self.PAGE_SIZE]
+
+    async def _show_page(self, interaction):
+        self.select.options = self._page_options()
+        self.select.placeholder = f"Choose an item... (page {self.page + 1}/{self.max_page + 1})"
+        await interaction.response.edit_message(view=self)
+
+    async def prev_page(self, interaction: discord.Interaction):
+        if interaction.user.id != self.user.id:
+            await interaction.response.send_message("This menu is not for you!", ephemeral=True)
+            return
+        self.page = max(0, self.page - 1)
+        await self._show_page(interaction)
+
+    async def next_page(self, interaction: discord.Interaction):
+        if interaction.user.id != self.user.id:
+            await interaction.response.send_message("This menu is not for you!", ephemeral=True)
+            return
+        self.page = min(self.max_page, self.page + 1)
+        await self._show_page(interaction)
 
     async def select_callback(self, interaction: discord.Interaction):
         if interaction.user.id != self.user.id:
@@ -122,10 +334,10 @@ class ItemSelectView(discord.ui.View):
             return
 
         selected_item_name = interaction.data["values"][0]
-        data = load_data()
+        load_data()
 
         # Find the selected item
-        item = next((i for i in data["items"] if i["name"] == selected_item_name), None)
+        item = _cache["index"].get(selected_item_name)
 
         if not item:
             await interaction.response.send_message("Item not found!", ephemeral=True)
@@ -146,6 +358,11 @@ class ItemSelectView(discord.ui.View):
         await interaction.response.send_message(embed=embed, view=view)
 
 
+# Pending DM prompts keyed by user ID: on_message routes the user's next DM
+# straight to the waiting verification instead of walking bot.wait_for checks
+_dm_waiters: dict[int, asyncio.Queue] = {}
+
+
 # View for purchase confirmation
 class PurchaseConfirmView(discord.ui.View):
     def __init__(self, item, user, gamepass_url):
@@ -165,21 +382,24 @@ class PurchaseConfirmView(discord.ui.View):
             await interaction.response.send_message("⏳ Verification already in progress...", ephemeral=True)
             return
 
+        # One verification per user at a time, even across different store menus
+        if interaction.user.id in _dm_waiters:
+            await interaction.response.send_message("⏳ Verification already in progress...", ephemeral=True)
+            return
+
         self.is_processing = True
+        queue = _dm_waiters[interaction.user.id] = asyncio.Queue()
 
         await interaction.response.send_message("🔄 Verifying your purchase... Please wait.", ephemeral=True)
         await interaction.followup.send("Please provide your Roblox username:")
 
-        def check(m):
-            return m.author.id == interaction.user.id and isinstance(m.channel, discord.DMChannel)
-
         try:
-            msg = await bot.wait_for('message', timeout=60.0, check=check)
+            msg = await asyncio.wait_for(queue.get(), timeout=60.0)
             roblox_username = msg.content.strip()
 
             logger.info(f"User provided username: {roblox_username}")
 
-            user_id = get_user_id_from_username(roblox_username)
+            user_id = await get_user_id_from_username(bot.session, roblox_username)
 
             if not user_id:
                 await interaction.followup.send("❌ Could not find that Roblox username. Please try again.")
@@ -188,18 +408,31 @@ class PurchaseConfirmView(discord.ui.View):
 
             logger.info(f"Converted to user ID: {user_id}")
 
+            # Poll with exponential backoff instead of fixed 5s sleeps, so
+            # verification finishes the moment the purchase shows up.
+            # Start at 2s so re-checks outlive the short negative-result cache
             verified = False
-            for attempt in range(5):
-                logger.info(f"Verification attempt {attempt + 1}/5")
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + 30
+            delay = 2.0
+            attempt = 0
+
+            while True:
+                attempt += 1
+                logger.info(f"Verification attempt {attempt}")
 
-                if check_gamepass_ownership(user_id, self.item['gamepass_id']):
+                if await check_gamepass_ownership(bot.session, user_id, self.item['gamepass_id']):
                     verified = True
                     break
 
-                if attempt < 4:
-                    await interaction.followup.send(
-                        f"⏳ Verification attempt {attempt + 1}/5... Checking again in 5 seconds.")
-                    await asyncio.sleep(5)
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+
+                await interaction.followup.send(
+                    f"⏳ Verification attempt {attempt}... Checking again shortly.")
+                await asyncio.sleep(min(delay, remaining))
+                delay *= 2
 
             if verified:
                 await interaction.followup.send(f"✅ Purchase verified! Here's your item: **{self.item['name']}**")
@@ -226,6 +459,8 @@ class PurchaseConfirmView(discord.ui.View):
             logger.error(f"Error during verification: {e}")
             await interaction.followup.send("❌ An error occurred during verification. Please try again.")
         finally:
+            if _dm_waiters.get(interaction.user.id) is queue:
+                _dm_waiters.pop(interaction.user.id)
             self.is_processing = False
 
     @discord.ui.button(label="Nevermind", style=discord.ButtonStyle.gray)
@@ -242,6 +477,19 @@ class PurchaseConfirmView(discord.ui.View):
 
 
 # Admin Commands
+def is_owner(interaction: discord.Interaction) -> bool:
+    """App-command check: only the server owner may run admin commands"""
+    return interaction.user.id == interaction.guild.owner_id
+
+
+@tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: app_commands.AppCommandError):
+    if isinstance(error, app_commands.CheckFailure):
+        await interaction.response.send_message("❌ Only the server owner can use this command!", ephemeral=True)
+        return
+    logger.error(f"App command error: {error}", exc_info=error)
+
+
 @tree.command(name="upload", description="Upload a new item to sell (Server Owner Only)")
 @app_commands.describe(
     item_name="Name of the item",
@@ -249,14 +497,11 @@ class PurchaseConfirmView(discord.ui.View):
     gamepass_id="Roblox Gamepass ID"
 )
 @app_commands.guild_only()
-async def upload(interaction: discord.Interaction, item_name: str, file: discord.Attachment, gamepass_id: str):
-    if interaction.user.id != interaction.guild.owner_id:
-        await interaction.response.send_message("❌ Only the server owner can use this command!", ephemeral=True)
-        return
-
+@app_commands.check(is_owner)
+async def upload(interaction: discord.Interaction, item_name: str, file: discord.Attachment, gamepass_id: int):
     data = load_data()
 
-    if any(item["name"] == item_name for item in data["items"]):
+    if item_name in _cache["index"]:
         await interaction.response.send_message(f"❌ An item with the name '{item_name}' already exists!",
                                                 ephemeral=True)
         return
@@ -268,7 +513,8 @@ async def upload(interaction: discord.Interaction, item_name: str, file: discord
     }
 
     data["items"].append(new_item)
-    save_data(data)
+    _cache["index"][item_name] = new_item
+    mark_dirty()
 
     embed = discord.Embed(
         title="✅ Item Uploaded",
@@ -289,15 +535,12 @@ async def upload(interaction: discord.Interaction, item_name: str, file: discord
     new_gamepass_id="New Gamepass ID (optional)"
 )
 @app_commands.guild_only()
+@app_commands.check(is_owner)
 async def edit(interaction: discord.Interaction, item_name: str, new_file: Optional[discord.Attachment] = None,
-               new_gamepass_id: Optional[str] = None):
-    if interaction.user.id != interaction.guild.owner_id:
-        await interaction.response.send_message("❌ Only the server owner can use this command!", ephemeral=True)
-        return
-
-    data = load_data()
+               new_gamepass_id: Optional[int] = None):
+    load_data()
 
-    item = next((i for i in data["items"] if i["name"] == item_name), None)
+    item = _cache["index"].get(item_name)
 
     if not item:
         await interaction.response.send_message(f"❌ Item '{item_name}' not found!", ephemeral=True)
@@ -308,7 +551,7 @@ async def edit(interaction: discord.Interaction, item_name: str, new_file: Optio
     if new_gamepass_id:
         item["gamepass_id"] = new_gamepass_id
 
-    save_data(data)
+    mark_dirty()
 
     embed = discord.Embed(
         title="✅ Item Updated",
@@ -327,21 +570,18 @@ async def edit(interaction: discord.Interaction, item_name: str, new_file: Optio
 @tree.command(name="delete", description="Delete an item (Server Owner Only)")
 @app_commands.describe(item_name="Name of the item to delete")
 @app_commands.guild_only()
+@app_commands.check(is_owner)
 async def delete(interaction: discord.Interaction, item_name: str):
-    if interaction.user.id != interaction.guild.owner_id:
-        await interaction.response.send_message("❌ Only the server owner can use this command!", ephemeral=True)
-        return
-
     data = load_data()
 
-    initial_length = len(data["items"])
-    data["items"] = [i for i in data["items"] if i["name"] != item_name]
+    item = _cache["index"].pop(item_name, None)
 
-    if len(data["items"]) == initial_length:
+    if item is None:
         await interaction.response.send_message(f"❌ Item '{item_name}' not found!", ephemeral=True)
         return
 
-    save_data(data)
+    data["items"].remove(item)
+    mark_dirty()
 
     embed = discord.Embed(
         title="✅ Item Deleted",
@@ -355,31 +595,40 @@ async def delete(interaction: discord.Interaction, item_name: str):
 
 @tree.command(name="showall", description="Show all uploaded items (Server Owner Only)")
 @app_commands.guild_only()
+@app_commands.check(is_owner)
 async def showall(interaction: discord.Interaction):
-    if interaction.user.id != interaction.guild.owner_id:
-        await interaction.response.send_message("❌ Only the server owner can use this command!", ephemeral=True)
-        return
-
     data = load_data()
 
     if not data["items"]:
         await interaction.response.send_message("📭 No items uploaded yet.", ephemeral=True)
         return
 
-    embed = discord.Embed(
-        title="📦 All Items",
-        description=f"Total items: {len(data['items'])}",
-        color=discord.Color.purple()
-    )
+    if _showall_cache["mtime"] != _cache["mtime"]:
+        embeds = []
+        # Discord caps embeds at 25 fields, so chunk large stores
+        for start in range(0, len(data["items"]), 25):
+            chunk = data["items"][start:start + 25]
+            embed = discord.Embed(
+                title="📦 All Items" if start == 0 else "📦 All Items (continued)",
+                description=f"Total items: {len(data['items'])}" if start == 0 else None,
+                color=discord.Color.purple()
+            )
+            for item in chunk:
+                embed.add_field(
+                    name=item["name"],
+                    value=f"**Gamepass ID:** {item['gamepass_id']}\n[File Link]({item['file_url']})",
+                    inline=False
+                )
+            embeds.append(embed)
+        _showall_cache["embeds"] = embeds
+        _showall_cache["mtime"] = _cache["mtime"]
 
-    for item in data["items"]:
-        embed.add_field(
-            name=item["name"],
-            value=f"**Gamepass ID:** {item['gamepass_id']}\n[File Link]({item['file_url']})",
-            inline=False
-        )
+    await interaction.response.send_message(embeds=_showall_cache["embeds"], ephemeral=True)
 
-    await interaction.response.send_message(embed=embed, ephemeral=True)
+
+# DM keywords the bot responds to; longer than any entry means no match
+_DM_COMMANDS = frozenset({"buyitem"})
+_DM_COMMAND_MAX_LEN = max(map(len, _DM_COMMANDS))
 
 
 @bot.event
@@ -387,8 +636,15 @@ async def on_message(message):
     if message.author.bot:
         return
 
-    if isinstance(message.channel, discord.DMChannel):
-        if message.content.lower() in ['buyitem']:
+    if message.guild is None and isinstance(message.channel, discord.DMChannel):
+        # A verification flow is waiting on this user's reply
+        queue = _dm_waiters.get(message.author.id)
+        if queue is not None:
+            queue.put_nowait(message)
+            return
+
+        content = message.content
+        if len(content) <= _DM_COMMAND_MAX_LEN and content.lower() in _DM_COMMANDS:
             data = load_data()
 
             if not data["items"]:
@@ -404,12 +660,22 @@ async def on_message(message):
             view = ItemSelectView(data["items"], message.author)
             await message.channel.send(embed=embed, view=view)
 
-    await bot.process_commands(message)
+    # Only run the prefix-command parser when a message could actually be one
+    if message.content.startswith(bot.command_prefix):
+        await bot.process_commands(message)
 
 
 @bot.event
 async def on_ready():
     try:
+        if bot.session is None or bot.session.closed:
+            bot.session = aiohttp.ClientSession(
+                timeout=aiohttp.ClientTimeout(total=10),
+                connector=aiohttp.TCPConnector(limit=50, limit_per_host=10,
+                                               ttl_dns_cache=300, enable_cleanup_closed=True)
+            )
+        if bot.writer_task is None or bot.writer_task.done():
+            bot.writer_task = asyncio.create_task(_writer_loop())
         await tree.sync()
         logger.info(f'✅ Bot is ready! Logged in as {bot.user}')
         logger.info(f'Bot ID: {bot.user.id}')
@@ -422,8 +688,32 @@ async def on_error(event, *args, **kwargs):
     logger.error(f"Error in {event}", exc_info=True)
 
 
+_bot_close = bot.close
+
+
+async def close():
+    """Flush pending saves and close the HTTP session before shutdown"""
+    if bot.writer_task:
+        bot.writer_task.cancel()
+    if _dirty_event.is_set():
+        await save_data_async(_cache["data"])
+    if bot.session and not bot.session.closed:
+        await bot.session.close()
+    await _bot_close()
+
+
+bot.close = close
+
+
 def main():
     """Main entry point for the bot"""
+    try:
+        import uvloop
+        uvloop.install()
+        logger.info("Using uvloop event loop")
+    except ImportError:
+        pass
+
     token = os.getenv("DISCORD_TOKEN")
 
     if not token: